@@ -1,61 +1,111 @@
 import pandas as pd
-import smtplib
+import aiosmtplib
+import dns.asyncresolver
+import dns.exception
 import dns.resolver
 import argparse
+import asyncio
+import logging
 import socket
 import sys
 import re
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger("guess")
+
 # ------------------------------------------------------------------------
 # Extract domain from URL
 # ------------------------------------------------------------------------
 
-def domain_from_url(url):
-    try:
-        if "://" in url:
-            url = url.split("://")[1]
-        return url.split("/")[0].replace("www.", "")
-    except:
-        return None
+def domains_from_urls(websites):
+    """Vectorized over a website Series; missing websites stay <NA>."""
+    return (
+        websites.astype("string")
+        .str.replace(r"^.*?://", "", regex=True)
+        .str.split("/").str[0]
+        .str.replace("www.", "", regex=False)
+    )
 
 # ------------------------------------------------------------------------
 # Get MX records for domain
 # ------------------------------------------------------------------------
 
-def get_mx_records(domain):
+_resolver = dns.asyncresolver.Resolver()
+_resolver.lifetime = 5
+_resolver.timeout = 2
+
+# domain -> MX hosts, including [] for domains that have none
+_mx_cache = {}
+
+async def get_mx_records(domain):
+    if domain in _mx_cache:
+        return _mx_cache[domain]
     try:
-        answers = dns.resolver.resolve(domain, 'MX')
-        return [str(r.exchange).rstrip('.') for r in answers]
+        answers = await _resolver.resolve(domain, 'MX')
+        mx_records = [str(r.exchange).rstrip('.') for r in answers]
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        log.debug(f"❌ MX lookup failed for {domain}: {e}")
+        mx_records = []
+    except dns.exception.Timeout as e:
+        # Not cached: resolve_all gives uncached domains a second try
+        log.debug(f"⌛ MX lookup timed out for {domain}: {e}")
+        return []
     except Exception as e:
-        print(f"❌ MX lookup failed for {domain}: {e}")
+        log.debug(f"❌ MX lookup failed for {domain}: {e}")
         return []
+    _mx_cache[domain] = mx_records
+    return mx_records
 
 # ------------------------------------------------------------------------
 # SMTP verify (RCPT TO handshake)
 # ------------------------------------------------------------------------
 
-def smtp_check(email, mx_records):
-    for mx in mx_records:
-        try:
-            print(f"📡 Connecting to {mx} to verify {email}…")
-
-            server = smtplib.SMTP(timeout=8)
-            server.connect(mx)
-            server.helo("example.com")
-            server.mail("probe@example.com")
-
-            code, msg = server.rcpt(email)
-            server.quit()
+# Times a dropped session (421 / disconnect) is reopened per MX
+MAX_RECONNECTS = 1
 
-            if code in [250, 251]:
-                print(f"✅ VERIFIED: {email}")
-                return True
-            else:
-                print(f"❌ Rejected: {email} -> {code}")
-        except Exception as e:
-            print(f"⚠️ SMTP error on {mx}: {e}")
+async def verify_candidates(candidates, mx_records):
+    """Probe all candidates over one session per MX, return the first accepted."""
+    for mx in mx_records:
+        remaining = list(candidates)
+        sessions = 0
+
+        while remaining and sessions <= MAX_RECONNECTS:
+            sessions += 1
+            smtp = aiosmtplib.SMTP(hostname=mx, timeout=5, start_tls=False)
+            try:
+                log.debug(f"📡 Connecting to {mx} to verify {len(remaining)} candidates…")
+                await smtp.connect()
+                await smtp.helo(hostname="example.com")
+                await smtp.mail("probe@example.com")
+
+                while remaining:
+                    email = remaining[0]
+                    try:
+                        await smtp.rcpt(email)
+                    except aiosmtplib.SMTPRecipientRefused as e:
+                        if e.code == 421:
+                            raise
+                        log.debug(f"❌ Rejected: {email} -> {e.code}")
+                        remaining.pop(0)
+                        continue
+
+                    log.debug(f"✅ VERIFIED: {email}")
+                    try:
+                        await smtp.quit()
+                    except Exception:
+                        pass  # already verified; finally closes the socket anyway
+                    return email
+            except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPRecipientRefused) as e:
+                # Session dropped mid-way: reconnect and resume with the rest
+                log.debug(f"⚠️ Session on {mx} dropped: {e}")
+            except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError) as e:
+                # SMTP/network failures only: bugs (TypeError...) must surface
+                log.debug(f"⚠️ SMTP error on {mx}: {e}")
+                break
+            finally:
+                smtp.close()
 
-    return False
+    return None
 
 # ------------------------------------------------------------------------
 # Generate candidate emails
@@ -66,6 +116,60 @@ CANDIDATES = ["info", "contact", "hello", "admin"]
 def guess_candidates(domain):
     return [f"{c}@{domain}" for c in CANDIDATES]
 
+# ------------------------------------------------------------------------
+# Per-row verification
+# ------------------------------------------------------------------------
+
+# Rows verified at the same time (every row is just socket waits)
+CONCURRENCY = 64
+
+async def process_row(domain, mx_map, sem):
+    async with sem:
+        mx_records = mx_map.get(domain, [])
+        # No MX, or Google MX which cannot be verified
+        if not mx_records or any("google.com" in mx.lower() for mx in mx_records):
+            return ""
+        # Try candidates
+        return await verify_candidates(guess_candidates(domain), mx_records) or ""
+
+
+async def resolve_all(domains, sem):
+    """Resolve every unique domain up front, concurrently."""
+    async def resolve(domain):
+        async with sem:
+            return await get_mx_records(domain)
+
+    domains = list(domains)
+    mx_map = dict(zip(domains, await asyncio.gather(*[resolve(d) for d in domains])))
+
+    # Timeouts (and other transient errors) aren't cached: retry those once
+    retry = [d for d in domains if d not in _mx_cache]
+    if retry:
+        log.debug(f"🔁 Retrying MX lookup for {len(retry)} domains")
+        mx_map.update(zip(retry, await asyncio.gather(*[resolve(d) for d in retry])))
+    return mx_map
+
+
+async def verify_rows(df):
+    """Build the verified_email column; only rows without an email are probed."""
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    have = df["email"].astype("string").str.contains("@", na=False)
+    verified = df["email"].where(have, "")
+
+    todo = domains_from_urls(df.loc[~have, "website"]).dropna()
+    todo = todo[todo != ""]
+
+    mx_map = await resolve_all(set(todo), sem)
+    log.info(f"📡 Resolved {len(mx_map)} domains, {sum(1 for mx in mx_map.values() if mx)} with MX records")
+
+    found = await asyncio.gather(*[process_row(domain, mx_map, sem) for domain in todo.tolist()])
+    verified.loc[todo.index] = found
+
+    n_found = sum(1 for email in found if email)
+    log.info(f"⏭️ {have.sum()} rows already had an email, ✅ {n_found} verified, ❌ {len(df) - have.sum() - n_found} without")
+    return verified
+
 # ------------------------------------------------------------------------
 # MAIN
 # ------------------------------------------------------------------------
@@ -78,51 +182,17 @@ def main():
     df = pd.read_csv(args.file_path)
 
     if "website" not in df.columns or "email" not in df.columns:
-        print("❌ CSV must contain 'website' and 'email' columns")
+        log.error("❌ CSV must contain 'website' and 'email' columns")
         sys.exit()
 
-    df["verified_email"] = ""
-
-    print("\n🔍 Starting REAL email verification…\n")
-
-    for i, row in df.iterrows():
-        website = row["website"]
-        existing_email = row["email"]
-
-        if isinstance(existing_email, str) and "@" in existing_email:
-            print(f"⏭️ Row {i}: already has email → {existing_email}")
-            df.loc[i, "verified_email"] = existing_email
-            continue
-
-        # Extract domain
-        domain = domain_from_url(website)
-        if not domain:
-            print(f"⚠️ No valid domain in website: {website}")
-            continue
-
-        print(f"\n==============================")
-        print(f"🌐 Row {i}: checking domain {domain}")
-        print("==============================")
-
-        # Get MX records
-        mx_records = get_mx_records(domain)
-        if not mx_records:
-            print("❌ No MX records found — skipping.")
-            continue
-        # Skip Google MX
-        if any("google.com" in mx.lower() for mx in mx_records):
-            print("⚠️ Google MX detected — cannot verify. Leaving email as None.")
-            continue
-        # Try candidates
-        for cand in guess_candidates(domain):
-            if smtp_check(cand, mx_records):
-                df.loc[i, "verified_email"] = cand
-                break
+    log.info("🔍 Starting REAL email verification…")
+
+    df["verified_email"] = asyncio.run(verify_rows(df))
 
     # Save result
     out_path = args.file_path.replace(".csv", "_verified.csv")
     df.to_csv(out_path, index=False)
-    print(f"\n🎉 DONE! Saved: {out_path}\n")
+    log.info(f"🎉 DONE! Saved: {out_path}")
 
 
 if __name__ == "__main__":
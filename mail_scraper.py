@@ -1,106 +1,194 @@
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+import math
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger("mail_scraper")
+
+# Both patterns run straight on the response bytes, no HTML parsing
 EMAIL_REGEX = re.compile(
-    r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    rb"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    re.IGNORECASE
+)
+# Raw HTML also holds asset names that look like addresses (logo@2x.png)
+ASSET_SUFFIX_REGEX = re.compile(
+    rb"\.(?:png|jpe?g|gif|webp|avif|svg|bmp|ico|css|js|woff2?|ttf|eot|mp4|webm)$",
     re.IGNORECASE
 )
+MAILTO_REGEX = re.compile(rb"""href=["']\s*mailto:([^"'?>\s]+)""", re.IGNORECASE)
+
+# One pooled session so repeated hosts reuse their TCP/TLS connection
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# Emails live in the header/nav/footer; never download more than this per page
+MAX_PAGE_BYTES = 512 * 1024
+
+# Servers that honour Range stop at the cap themselves (206); the rest send 200
+_session.headers.update({
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip",
+    "Range": f"bytes=0-{MAX_PAGE_BYTES - 1}",
+})
+
+WORKERS = 16
+POLITE_DELAY = 1  # seconds between two requests to the same host
+
+
+class HostThrottle:
+    """Spaces requests to the same host; different hosts never wait on each other."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, host):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_throttle = HostThrottle(POLITE_DELAY)
+
+# Hosts that could not be connected to once are not retried (timeouts are
+# not counted: a slow answer doesn't mean the host is gone)
+_dead_hosts = set()
+_dead_hosts_lock = threading.Lock()
 
 
 def fetch_html(url):
-    print(f"\n🌐 Fetching URL: {url}")
+    if not url:
+        return None
+
+    log.debug(f"🌐 Fetching URL: {url}")
 
     # Ensure proper scheme
     if not url.startswith("http"):
         url = "https://" + url
-        print(f"🔧 Fixed URL → {url}")
+        log.debug(f"🔧 Fixed URL → {url}")
+
+    host = urlsplit(url).netloc
+    if host in _dead_hosts:
+        log.debug(f"☠️ Host already failed, skipping: {host}")
+        return None
 
     try:
-        response = requests.get(url, timeout=10, headers={
-            "User-Agent": "Mozilla/5.0"
-        })
-        print(f"🔍 HTTP status: {response.status_code}")
+        _throttle.wait(host)
+        with _session.get(url, timeout=10, stream=True) as response:
+            log.debug(f"🔍 HTTP status: {response.status_code}")
+
+            if response.status_code >= 400:
+                log.debug("❌ Bad status code, skipping.")
+                return None
 
-        if response.status_code >= 400:
-            print("❌ Bad status code, skipping.")
-            return None
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and not content_type.startswith("text/"):
+                log.debug(f"❌ Not a web page ({content_type}), skipping.")
+                return None
 
-        return response.text
+            return response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+
+    except requests.Timeout as e:
+        # ConnectTimeout is also a ConnectionError: catch it first, the host stays usable
+        log.debug(f"⌛ Request timed out: {e}")
+        return None
+
+    except requests.ConnectionError as e:
+        log.debug(f"💥 Host unreachable: {e}")
+        with _dead_hosts_lock:
+            _dead_hosts.add(host)
+        return None
 
     except Exception as e:
-        print(f"💥 Request failed: {e}")
+        log.debug(f"💥 Request failed: {e}")
         return None
 
 
 def extract_email_from_html(html):
     """Search HTML for mailto: first, then fallback regex."""
-    print("🔎 Searching for email in HTML…")
-
-    soup = BeautifulSoup(html, "html.parser")
-    text_content = soup.get_text(separator=" ")
+    log.debug("🔎 Searching for email in HTML…")
 
-    # 1) MAILTO scan
-    for link in soup.find_all("a", href=True):
-        href = link["href"].lower()
-        if "mailto:" in href:
-            email = href.replace("mailto:", "").split("?")[0]
-            print(f"📬 MAILTO found → {email}")
+    # 1) MAILTO scan (skip mailto links that don't hold an address)
+    for match in MAILTO_REGEX.finditer(html):
+        if EMAIL_REGEX.search(match.group(1)):
+            email = match.group(1).decode("utf-8", "ignore").lower()
+            log.debug(f"📬 MAILTO found → {email}")
             return email
 
-    print("⚠️ No mailto: found. Trying regex…")
+    log.debug("⚠️ No mailto: found. Trying regex…")
 
-    # 2) Regex fallback search
-    match = EMAIL_REGEX.search(text_content)
-    if match:
-        print(f"📧 REGEX email found → {match.group(0)}")
-        return match.group(0)
+    # 2) Regex fallback search (skip asset names like logo@2x.png)
+    for match in EMAIL_REGEX.finditer(html):
+        if ASSET_SUFFIX_REGEX.search(match.group(0)):
+            continue
+        email = match.group(0).decode("utf-8", "ignore")
+        log.debug(f"📧 REGEX email found → {email}")
+        return email
 
-    print("❌ No email found on this page.")
+    log.debug("❌ No email found on this page.")
     return None
 
 
 def main():
-    print("🚀 Starting EMAIL SCRAPER")
+    log.info("🚀 Starting EMAIL SCRAPER")
 
     df = pd.read_csv("GMaps Data/2025-11-25/promotora_espectaculos_in_Barcelona.csv")
-    print(f"📄 CSV loaded with {len(df)} rows.")
+    log.info(f"📄 CSV loaded with {len(df)} rows.")
 
-    results = []
+    websites = [
+        "" if website is None or (isinstance(website, float) and math.isnan(website)) else str(website).strip()
+        for website in df["website"].tolist()
+    ]
 
-    for index, row in df.iterrows():
-        print("\n============================")
-        print(f"🔍 ROW {index}")
-        print("============================")
+    # Fetching is all network wait, so pages are downloaded in parallel,
+    # and a website shared by several rows (chains) is downloaded once
+    unique = list(dict.fromkeys(websites))
+    with ThreadPoolExecutor(max_workers=WORKERS) as ex:
+        pages = dict(zip(unique, ex.map(fetch_html, unique)))
+    htmls = [pages[website] for website in websites]
 
-        website = "" if pd.isna(row.get("website")) else str(row.get("website")).strip()
+    results = [None] * len(df)
 
-        print(f"🌐 Website: {website}")
+    for i, (index, website, html) in enumerate(zip(df.index, websites, htmls)):
+        log.debug(f"🔍 ROW {index} — 🌐 Website: {website}")
 
-        if not website or website.strip() == "":
-            print("⚠️ No website field. Skipping.")
-            results.append(None)
+        if not website:
+            log.debug("⚠️ No website field. Skipping.")
             continue
 
-        html = fetch_html(website)
         if html is None:
-            print("❌ No HTML retrieved. Skipping.")
-            results.append(None)
+            log.debug("❌ No HTML retrieved. Skipping.")
             continue
 
         email = extract_email_from_html(html)
-        results.append(email)
+        results[i] = email
 
-        print(f"✅ FINAL EMAIL for row {index}: {email}")
-        time.sleep(1)  # polite delay
+        log.debug(f"✅ FINAL EMAIL for row {index}: {email}")
 
     df["email"] = results
+    log.info(f"✅ Found {sum(1 for email in results if email)} emails for {len(df)} rows")
 
     out_file = "scraped_with_emails.csv"
     df.to_csv(out_file, index=False)
-    print(f"\n💾 Saved results to {out_file}")
+    log.info(f"💾 Saved results to {out_file}")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,18 @@
 import datetime
 from playwright.sync_api import sync_playwright
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 import pandas as pd
 import argparse
+import csv
+import logging
 import os
+import re
 import sys
 
-@dataclass
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger("main")
+
+@dataclass(slots=True)
 class Business:
     """holds business data"""
     name: str = None
@@ -20,24 +26,6 @@ class Business:
     reviews_average: float = None
     latitude: float = None
     longitude: float = None
-    
-    def __hash__(self):
-        """Make Business hashable for duplicate detection.
-        Consider businesses different if:
-        - Name is different, OR
-        - Same name but different non-empty contact info (domain/website/phone)
-        """
-        # Create a tuple of fields that must match for duplicates
-        # We'll include name plus any non-empty contact info fields
-        hash_fields = [self.name]
-        if self.domain:
-            hash_fields.append(f"domain:{self.domain}")
-        if self.website:
-            hash_fields.append(f"website:{self.website}")
-        if self.phone_number:
-            hash_fields.append(f"phone:{self.phone_number}")
-        
-        return hash(tuple(hash_fields))
 
 @dataclass
 class BusinessList:
@@ -46,25 +34,34 @@ class BusinessList:
     """
     business_list: list[Business] = field(default_factory=list)
     _seen_businesses: set = field(default_factory=set, init=False)
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
-    save_at = os.path.join('GMaps Data', today)
-    os.makedirs(save_at, exist_ok=True) 
+    today: str = field(init=False)
+    save_at: str = field(init=False)
+
+    def __post_init__(self):
+        """date and output folder are taken when the list is created, not at import"""
+        self.today = datetime.datetime.now().strftime("%Y-%m-%d")
+        self.save_at = os.path.join('GMaps Data', self.today)
+        os.makedirs(self.save_at, exist_ok=True)
 
     def add_business(self, business: Business):
-        """Add a business to the list if it's not a duplicate based on key attributes"""
-        business_hash = hash(business)
-        if business_hash not in self._seen_businesses:
+        """Add a business to the list if it's not a duplicate based on key attributes.
+        Consider businesses different if:
+        - Name is different, OR
+        - Same name but different non-empty contact info (domain/website/phone)
+        """
+        key = (business.name, business.domain or "", business.website or "", business.phone_number or "")
+        if key not in self._seen_businesses:
+            self._seen_businesses.add(key)
             self.business_list.append(business)
-            self._seen_businesses.add(business_hash)
     
     def dataframe(self):
         """transform business_list to pandas dataframe
 
         Returns: pandas dataframe
         """
-        return pd.json_normalize(
-            (asdict(business) for business in self.business_list), sep="_"
-        )
+        cols = [f.name for f in fields(Business)]
+        rows = [[getattr(business, c) for c in cols] for business in self.business_list]
+        return pd.DataFrame(rows, columns=cols)
 
     def save_to_excel(self, filename):
         """saves pandas dataframe to excel (xlsx) file
@@ -75,27 +72,56 @@ class BusinessList:
         self.dataframe().to_excel(f"{self.save_at}/{filename}.xlsx", index=False)
 
     def save_to_csv(self, filename):
-        """saves pandas dataframe to csv file
+        """saves business_list to csv file, row by row with the csv module
+        (no dataframe needed for a flat table)
 
         Args:
             filename (str): filename
         """
-        self.dataframe().to_csv(f"{self.save_at}/{filename}.csv", index=False)
+        cols = [f.name for f in fields(Business)]
+        with open(f"{self.save_at}/{filename}.csv", "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(cols)
+            writer.writerows([getattr(business, c) for c in cols] for business in self.business_list)
+
+LISTING_XPATH = '//a[contains(@href, "/maps/place/")]'
+LISTING_HREFS_JS = "links => links.map(a => a.href)"
+
+# Selectors for the details pane, built once instead of per listing
+FIELDS = {
+    "name": 'h1.DUwDvf',
+    "address": '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]',
+    "website": '//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]',
+    "phone_number": '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]',
+    "reviews_count": '//div[@jsaction="pane.reviewChart.moreReviews"]//span',
+    "reviews_average": '//div[@jsaction="pane.reviewChart.moreReviews"]//div[@role="img"]',
+}
+
+REVIEWS_COUNT_REGEX = re.compile(r"(\d[\d,]*)")
+STARS_REGEX = re.compile(r"(\d+(?:[.,]\d+)?)")
+
+# Fields read from an attribute instead of the inner text
+FIELD_ATTRIBUTES = {"reviews_average": "aria-label"}
+
+# Reads every FIELDS selector in one browser round-trip; missing fields are null
+DETAILS_JS = """([fields, attributes]) => {
+    const first = (sel) => sel.startsWith('//')
+        ? document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(sel);
+    const data = {};
+    for (const [key, sel] of Object.entries(fields)) {
+        const node = first(sel);
+        data[key] = !node ? null : attributes[key] ? node.getAttribute(attributes[key]) : node.innerText;
+    }
+    return data;
+}"""
+
+COORDINATES_REGEX = re.compile(r"/@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)")
 
 def extract_coordinates_from_url(url: str) -> tuple[float, float]:
     """helper function to extract coordinates from url"""
-    if '/@' not in url:
-        return None, None 
-        
-    coordinates = url.split('/@')[-1].split('/')[0]
-    
-    parts = coordinates.split(',')
-    if len(parts) >= 2:
-        try:
-            return float(parts[0]), float(parts[1])
-        except ValueError:
-            return None, None
-    return None, None
+    m = COORDINATES_REGEX.search(url)
+    return (float(m.group(1)), float(m.group(2))) if m else (None, None)
 
 
 def main():
@@ -146,12 +172,13 @@ def main():
             
             try:
                 # Wait for the first link to appear, ensuring the results pane is ready
-                page.wait_for_selector('//a[contains(@href, "/maps/place/")]', timeout=8000)
+                page.wait_for_selector(LISTING_XPATH, timeout=8000)
                 scroll_container = page.locator(scrollable_element_xpath).nth(0)
             except:
                 print("No results found or page loading failed for this search.")
                 continue
 
+            listings = page.locator(LISTING_XPATH)
             previously_counted = 0
             
             # We will scroll repeatedly until the number of listings stabilizes
@@ -162,7 +189,7 @@ def main():
                 scroll_container.evaluate('el => el.scrollTop = el.scrollHeight')
                 page.wait_for_timeout(2000)
 
-                current_count = page.locator('//a[contains(@href, "/maps/place/")]').count()
+                current_count = listings.count()
 
                 if current_count >= total:
                     print(f"Total Scraped: {current_count} (reached total limit: {total})")
@@ -184,64 +211,42 @@ def main():
             # --- 4. Scraping Individual Business Details ---
             business_list = BusinessList()
             
-            all_listing_links = page.locator('//a[contains(@href, "/maps/place/")]').all()
-            listings_to_scrape = all_listing_links[:total]
+            # Collect the place URLs once and open each one directly
+            listings_to_scrape = listings.evaluate_all(LISTING_HREFS_JS)[:total]
             
-            for i, listing_link_locator in enumerate(listings_to_scrape):
+            for i, href in enumerate(listings_to_scrape):
                 try:                        
-                    # 1. Click the specific link locator to open the details pane
-                    listing_link_locator.click()
-                    page.wait_for_timeout(2000)
+                    # 1. Go straight to the place page instead of clicking the card
+                    page.goto(href, wait_until="domcontentloaded", timeout=15000)
+                    page.wait_for_selector(FIELDS["name"], state="visible", timeout=8000)
                     
                     # 2. Scrape details from the open pane
-                    
-                    name_attribute = 'h1.DUwDvf'
-                    address_xpath = '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'
-                    website_xpath = '//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]'
-                    phone_number_xpath = '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'
-                    review_count_xpath = '//div[@jsaction="pane.reviewChart.moreReviews"]//span'
-                    reviews_average_xpath = '//div[@jsaction="pane.reviewChart.moreReviews"]//div[@role="img"]' 
-                                                           
                     business = Business()
-                   
-                    if name_value := page.locator(name_attribute).inner_text():
-                        business.name = name_value.strip()
-                    else:
-                        business.name = ""
+                    data = page.evaluate(DETAILS_JS, [FIELDS, FIELD_ATTRIBUTES])
 
-                    if page.locator(address_xpath).count() > 0:
-                        business.address = page.locator(address_xpath).all()[0].inner_text()
-                    else:
-                        business.address = ""
+                    business.name = (data["name"] or "").strip()
+                    business.address = (data["address"] or "").strip()
 
-                    website_element = page.locator(website_xpath)
-                    if website_element.count() > 0:
-                        business.domain = website_element.all()[0].inner_text()
-                        business.website = f"https://{business.domain}" 
+                    if domain := (data["website"] or "").strip():
+                        business.domain = domain
+                        business.website = f"https://{business.domain}"
                     else:
                         business.website = ""
 
-                    if page.locator(phone_number_xpath).count() > 0:
-                        business.phone_number = page.locator(phone_number_xpath).all()[0].inner_text()
-                    else:
-                        business.phone_number = ""
-                        
-                    if page.locator(review_count_xpath).count() > 0:
-                        count_text = page.locator(review_count_xpath).inner_text().split()[0].replace(',', '').strip()
-                        business.reviews_count = int(count_text) if count_text.isdigit() else 0
+                    business.phone_number = (data["phone_number"] or "").strip()
+
+                    if data["reviews_count"] is not None:
+                        m = REVIEWS_COUNT_REGEX.search(data["reviews_count"])
+                        business.reviews_count = int(m.group(1).replace(',', '')) if m else 0
                     else:
                         business.reviews_count = ""
-                        
-                    if page.locator(reviews_average_xpath).count() > 0:
-                        avg_label = page.locator(reviews_average_xpath).get_attribute('aria-label')
-                        if avg_label:
-                            parts = avg_label.split()
-                            number_str = next((p.replace(',', '.') for p in parts if p.replace(',', '.').replace('.', '', 1).isdigit()), None)
-                            if number_str:
-                                business.reviews_average = float(number_str)
+
+                    if data["reviews_average"] is not None:
+                        if m := STARS_REGEX.search(data["reviews_average"] or ""):
+                            business.reviews_average = float(m.group(1).replace(',', '.'))
                     else:
                         business.reviews_average = ""
-                
+
                     clean_search = search_for.strip()
                     if ' in ' in clean_search:
                         business.category = clean_search.split(' in ')[0].strip()
@@ -255,11 +260,13 @@ def main():
                     business_list.add_business(business)
                     
                     # LOGGING THE INFO AS REQUESTED 
-                    print(f"✅ LOGGED [{i+1}/{len(listings_to_scrape)}]: Name: {business.name or 'N/A'}, Website: {business.website or 'N/A'}")
+                    log.debug(f"✅ LOGGED [{i+1}/{len(listings_to_scrape)}]: Name: {business.name or 'N/A'}, Website: {business.website or 'N/A'}")
                     
                 except Exception as e:
-                    print(f'Error occurred for listing {i+1}: {e}')
+                    log.warning(f'Error occurred for listing {i+1}: {e}')
             
+            log.info(f"✅ Scraped {len(business_list.business_list)} businesses for {search_for}")
+
             # output
             clean_search_for = search_for.strip().replace(' ', '_').replace('/', '_')
             business_list.save_to_excel(clean_search_for)
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
+import atexit
+import csv
 import datetime
 import logging
 import os
+import queue
 import re
 import sys
 import time
@@ -13,16 +17,15 @@ from rich.prompt import Prompt, IntPrompt, Confirm
 from rich import print as rprint
 from rich.text import Text
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, asdict, field
+from logging.handlers import QueueHandler, QueueListener
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
 from typing import Optional, Tuple
+from urllib.parse import urlsplit
 
+import aiohttp
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # =========================================================
 # LOGGING
@@ -31,15 +34,22 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 os.makedirs("logs", exist_ok=True)
 os.makedirs("output", exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s — %(levelname)s — %(message)s",
-    datefmt="%H:%M:%S",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("logs/scraper.log", encoding="utf8")
-    ]
-)
+# Los logs solo se encolan; un hilo aparte los escribe en consola y fichero,
+# así el event loop nunca espera al disco ni al lock de los handlers
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter("%(asctime)s — %(levelname)s — %(message)s", datefmt="%H:%M:%S")
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler("logs/scraper.log", encoding="utf8")
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # vacía la cola antes de salir
+
+logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[QueueHandler(_log_queue)])
 log = logging.getLogger("scraper")
 
 console = Console()
@@ -87,7 +97,8 @@ def get_user_inputs():
 
     search_query = Prompt.ask(" [cyan]Search query[/cyan]", default="cafes in Barcelona")
     total_results = IntPrompt.ask(" [cyan]How many results?[/cyan]", default=20)
-    workers = IntPrompt.ask(" [cyan]Number of workers (threads)[/cyan]", default=10)
+    workers = IntPrompt.ask(" [cyan]Number of workers[/cyan]", default=10)
+    details = Confirm.ask(" [cyan]Open each business for address, phone & website? (slower)[/cyan]", default=True)
     headless = Confirm.ask(" [yellow]Run in headless mode?[/yellow]", default=True)
 
     console.print("\n[bold green]Starting MapScrap...[/bold green]\n")
@@ -95,6 +106,7 @@ def get_user_inputs():
         "search": search_query,
         "total": total_results,
         "workers": workers,
+        "details": details,
         "headless": headless
     }
 
@@ -107,37 +119,189 @@ EMAIL_PATHS = [
     "about", "about-us", "info", "information"
 ]
 
+# Run on the raw response bytes: no decoding or parsing of the page
 EMAIL_REGEX = re.compile(
-    r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    rb"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    re.IGNORECASE
+)
+# Raw HTML also holds asset names that look like addresses (logo@2x.png)
+ASSET_SUFFIX_REGEX = re.compile(
+    rb"\.(?:png|jpe?g|gif|webp|avif|svg|bmp|ico|css|js|woff2?|ttf|eot|mp4|webm)$",
     re.IGNORECASE
 )
 
-def fetch_html(url: str) -> Optional[str]:
+# One pass over every href on the page: mailto links and social profiles.
+# The named group that matched (m.lastgroup) says what kind of link it is
+LINK_REGEX = re.compile(rb"""
+    href=["']\s*(?:
+        mailto:(?P<mail>[^"'?>\s]+)
+      | [^"'\s]*?instagram\.com/(?P<ig>[a-z0-9._]+)
+      | [^"'\s]*?tiktok\.com/@(?P<tt>[a-z0-9._]+)
+      | [^"'\s]*?(?:wa\.me/|api\.whatsapp\.com/[^"'\s]*?phone=)(?P<wa>\d+)
+      | (?P<fb>[^"'\s]*?facebook\.com/[^"'\s?#]+)
+      | (?P<li>[^"'\s]*?linkedin\.com/(?:in|company)/[^"'\s?#]+)
+    )
+""", re.IGNORECASE | re.VERBOSE)
+SOCIAL_KINDS = LINK_REGEX.groups - 1  # todas menos "mail"
+
+# Un solo event loop hace todas las peticiones; la sesión reutiliza conexiones
+CONNECTOR_LIMIT = 200
+CONNECTOR_LIMIT_PER_HOST = 8     # web + contacto + IG: sockets keep-alive por host
+KEEPALIVE_TIMEOUT = 30           # segundos que una conexión libre sigue abierta
+DNS_CACHE_TTL = 300              # la web y sus páginas de contacto resuelven una sola vez
+RETRY_STATUSES = {502, 503, 504}
+RETRIES = 2
+RETRY_BACKOFF = 0.3              # 0.3s, 0.6s...
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=12)
+# IG casi nunca da nada a un scraper. Agotar este timeout solo descarta esta
+# bio: instagram.com no pasa a _dead_hosts y el resto de negocios lo siguen probando
+IG_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# Emails live in the header/nav/footer; never download more than this per page
+MAX_PAGE_BYTES = 512 * 1024
+
+# Range lets servers that support it stop at the cap themselves; the rest
+# ignore it and answer 200, and the read below still stops at MAX_PAGE_BYTES
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip",
+    "Range": f"bytes=0-{MAX_PAGE_BYTES - 1}",
+}
+
+
+# Hosts we could not connect to at all: no more requests this run.
+# Only the event loop thread touches it, so it needs no lock
+_dead_hosts = set()
+
+
+async def fetch_html(session: aiohttp.ClientSession, sem: asyncio.Semaphore, url: str,
+                     timeout: aiohttp.ClientTimeout = FETCH_TIMEOUT) -> Optional[bytes]:
     if not url or not url.startswith("http"):
         url = "https://" + url.lstrip("https:/")
-    try:
-        return requests.get(url, timeout=12, verify=False, headers={"User-Agent": "Mozilla/5.0"}).text
-    except:
+    host = urlsplit(url).netloc
+    if host in _dead_hosts:
         return None
+    for attempt in range(RETRIES + 1):
+        try:
+            async with sem, session.get(url, timeout=timeout) as r:
+                if r.status not in RETRY_STATUSES or attempt == RETRIES:
+                    content_type = r.headers.get("Content-Type", "")
+                    if content_type and not content_type.startswith("text/"):
+                        return None  # PDFs, images...
+                    buf = bytearray()
+                    async for chunk in r.content.iter_chunked(64 * 1024):
+                        buf += chunk
+                        if len(buf) >= MAX_PAGE_BYTES:
+                            break
+                    return bytes(buf[:MAX_PAGE_BYTES])
+        except aiohttp.ClientConnectorError:
+            # DNS, rechazo o fallo al conectar. Un timeout no cuenta: también
+            # corre mientras se espera un hueco libre en el conector
+            _dead_hosts.add(host)
+            return None
+        except Exception:
+            return None
+        # 502/503/504: esperar fuera del semáforo y reintentar
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+def scan_links(html: bytes, links: Optional[list] = None) -> list:
+    """
+    Single LINK_REGEX pass: returns the mailto addresses and, if `links` is
+    given, appends every social (kind, value) match to it on the way.
+    """
+    mailtos = []
+    for m in LINK_REGEX.finditer(html):
+        kind = m.lastgroup
+        if kind == "mail":
+            if EMAIL_REGEX.search(m.group(kind)):
+                mailtos.append(m.group(kind).lower())
+        elif links is not None:
+            links.append((kind, m.group(kind)))
+    return mailtos
+
+
+def _email_candidates(html: bytes, mailtos: list):
+    # 1) mailto
+    yield from mailtos
 
+    # 2) raw regex, skipping image/script file names
+    for m in EMAIL_REGEX.finditer(html):
+        if not ASSET_SUFFIX_REGEX.search(m.group(0)):
+            yield m.group(0)
 
-def extract_email(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
 
-    # 1) mailto
-    for a in soup.find_all("a", href=True):
-        h = a["href"].lower()
-        if h.startswith("mailto:"):
-            email = h.replace("mailto:", "").split("?")[0]
-            if EMAIL_REGEX.search(email):
-                return email
+def extract_email(html: bytes, domain: str = "", links: Optional[list] = None) -> Optional[str]:
+    """
+    First email in the page (mailto links first); if `domain` is given, an
+    address on the site's own domain wins over third-party ones. Social links
+    seen while looking for mailtos are collected into `links`.
+    """
+    own = b"@" + domain.encode() if domain else None
+    first = None
+    for email in _email_candidates(html, scan_links(html, links)):
+        if own is None or email.lower().endswith(own):
+            return email.decode("utf-8", "ignore")
+        first = first or email
+    return first.decode("utf-8", "ignore") if first else None
+
 
-    # 2) raw regex
-    m = EMAIL_REGEX.search(soup.get_text(" "))
-    return m.group(0) if m else None
+# "" y "contact" salen primero; el resto solo si no dan email en este margen
+PRIORITY_PATHS = 2
+PRIORITY_WINDOW = 0.3  # segundos
 
 
-def smart_email_scrape(website: str) -> dict:
+async def first_email(session, sem, base: str, domain: str, home: asyncio.Task) -> Tuple[Optional[str], Optional[str], Optional[list]]:
+    """
+    Devuelve (email, url, links): email y url de la primera página de
+    EMAIL_PATHS que tenga email, y los enlaces sociales de la home si ya se
+    escaneó (None si no). `home` es la tarea ya lanzada para la página principal.
+    """
+    loop = asyncio.get_running_loop()
+    urls = {home: base}
+    checked = set()
+    home_links = None
+
+    def submit(path):
+        url = f"{base}/{path}"
+        urls[asyncio.create_task(fetch_html(session, sem, url))] = url
+
+    async def scan(timeout=None):
+        nonlocal home_links
+        pending = {t for t in urls if t not in checked}
+        deadline = None if timeout is None else loop.time() + timeout
+        while pending:
+            left = None if deadline is None else max(0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=left, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break  # se acabó el margen
+            for t in done:
+                checked.add(t)
+                html = t.result()
+                links = None
+                if t is home:
+                    links = home_links = []  # las redes salen del mismo barrido
+                email = extract_email(html, domain, links) if html else None
+                if email:
+                    return email, urls[t]
+        return None, None
+
+    try:
+        for path in EMAIL_PATHS[1:PRIORITY_PATHS]:
+            submit(path)
+        email, url = await scan(PRIORITY_WINDOW)
+        if not email:
+            for path in EMAIL_PATHS[PRIORITY_PATHS:]:
+                submit(path)
+            email, url = await scan()
+        return email, url, home_links
+    finally:
+        for t in urls:
+            if t is not home:  # la home hace falta para las redes
+                t.cancel()
+
+
+async def smart_email_scrape(session: aiohttp.ClientSession, sem: asyncio.Semaphore, website: str) -> dict:
     """
     MapScrap 2025 — Extrae TODO:
     email, IG, WhatsApp, FB, TikTok, LinkedIn
@@ -157,76 +321,87 @@ def smart_email_scrape(website: str) -> dict:
     if not base.startswith("http"):
         base = "https://" + base.replace("https://", "").replace("http://", "")
 
-    log.info(f"Extracting ALL contacts from {base}")
+    domain = urlsplit(base).netloc.lower().removeprefix("www.")
 
-    html = fetch_html(base)
-    if not html:
-        return result
+    log.debug(f"Extracting ALL contacts from {base}")
 
-    soup = BeautifulSoup(html, "html.parser")
+    # 1. Email: home y páginas de contacto a la vez, gana la primera con email
+    home = asyncio.create_task(fetch_html(session, sem, base))
+    try:
+        email, source, links = await first_email(session, sem, base, domain, home)
+        html = await home
+    finally:
+        home.cancel()
 
-    # 1. Email clásico
-    email = extract_email(html)
-    if email and not result["email"]:
+    if email:
         result["email"] = email
-        result["email_source"] = base
-        log.info(f"  Email en web → {email}")
+        result["email_source"] = source
+        log.debug(f"  Email en {source} → {email}")
 
-    # 2. Recorrer todos los <a href>
-    for a in soup.find_all("a", href=True):
-        href = a["href"].lower().strip()
-        url = a["href"]
+    if not html:
+        return result
+
+    # 2. Redes: ya recogidas al buscar el email en la home, salvo que ganara
+    #    otra página antes de que llegara
+    if links is None:
+        links = []
+        scan_links(html, links)
+
+    found = set()
+    for kind, value in links:
+        if kind in found:
+            continue
+        value = value.decode("utf-8", "ignore")
 
         # ── Instagram ──
-        if "instagram.com" in href and not result["instagram_username"]:
-            m = re.search(r"instagram\.com/([a-zA-Z0-9._]+)", href)
-            if m:
-                username = m.group(1).split("?")[0].rstrip("/")
-                if username and username != "p" and not username.startswith(("explore", "accounts", "reel")) and 3 <= len(username) <= 30:
-                    result["instagram_username"] = username
-                    result["instagram_url"] = f"https://instagram.com/{username}"
-                    log.info(f"  Instagram → @{username}")
-
-                    # Bonus: email en bio de IG
-                    ig_html = fetch_html(result["instagram_url"])
-                    if ig_html and not result["email"]:
-                        bio_mail = EMAIL_REGEX.search(ig_html)
-                        if bio_mail:
-                            result["email"] = bio_mail.group(0)
-                            result["email_source"] = result["instagram_url"]
-                            log.info(f"  EMAIL EN BIO IG → {result['email']}")
+        if kind == "ig":
+            username = value.lower()
+            if username != "p" and not username.startswith(("explore", "accounts", "reel")) and 3 <= len(username) <= 30:
+                found.add(kind)
+                result["instagram_username"] = username
+                result["instagram_url"] = f"https://instagram.com/{username}"
+                log.debug(f"  Instagram → @{username}")
+
+                # Bonus: email en bio de IG, solo si la web no dio ninguno
+                if not result["email"]:
+                    ig_html = await fetch_html(session, sem, result["instagram_url"], IG_TIMEOUT)
+                    bio_mail = extract_email(ig_html) if ig_html else None
+                    if bio_mail:
+                        result["email"] = bio_mail
+                        result["email_source"] = result["instagram_url"]
+                        log.debug(f"  EMAIL EN BIO IG → {result['email']}")
 
         # ── TikTok ──
-        if "tiktok.com" in href and not result["tiktok_username"]:
-            m = re.search(r"tiktok\.com/@([a-zA-Z0-9._]+)", href)
-            if m:
-                username = m.group(1).split("?")[0]
-                if 1 <= len(username) <= 40:
-                    result["tiktok_username"] = username
-                    result["tiktok_url"] = f"https://tiktok.com/@{username}"
-                    log.info(f"  TikTok → @{username}")
+        elif kind == "tt":
+            if len(value) <= 40:
+                found.add(kind)
+                result["tiktok_username"] = value
+                result["tiktok_url"] = f"https://tiktok.com/@{value}"
+                log.debug(f"  TikTok → @{value}")
 
         # ── WhatsApp ──
-        if ("wa.me" in href or "api.whatsapp.com" in href) and not result["whatsapp_number"]:
-            m = re.search(r"wa\.me/(\d+)|phone=(\d+)", href)
-            if m:
-                phone = m.group(1) or m.group(2)
-                result["whatsapp_number"] = phone
-                log.info(f"  WhatsApp → {phone}")
+        elif kind == "wa":
+            found.add(kind)
+            result["whatsapp_number"] = value
+            log.debug(f"  WhatsApp → {value}")
 
         # ── Facebook ──
-        if "facebook.com" in href and not result["facebook_url"]:
-            clean = url.split("?")[0].split("#")[0].rstrip("/")
+        elif kind == "fb":
+            clean = value.rstrip("/")
             if clean.count("/") >= 3:  # es un perfil/página real
+                found.add(kind)
                 result["facebook_url"] = clean
-                log.info(f"  Facebook → {clean}")
+                log.debug(f"  Facebook → {clean}")
 
         # ── LinkedIn ──
-        if "linkedin.com" in href and not result["linkedin_url"]:
-            if "/in/" in href or "/company/" in href:
-                clean = url.split("?")[0].rstrip("/")
-                result["linkedin_url"] = clean
-                log.info(f"  LinkedIn → {clean}")
+        elif kind == "li":
+            clean = value.rstrip("/")
+            found.add(kind)
+            result["linkedin_url"] = clean
+            log.debug(f"  LinkedIn → {clean}")
+
+        if len(found) == SOCIAL_KINDS:
+            break  # ya están todas las redes
 
     return result
 
@@ -234,7 +409,7 @@ def smart_email_scrape(website: str) -> dict:
 # DATA MODELS
 # =========================================================
 
-@dataclass
+@dataclass(slots=True)
 class Business:
     name: str = ""
     address: str = ""
@@ -256,11 +431,13 @@ class Business:
     tiktok_username: str = ""        # ← NUEVO
     tiktok_url: str = ""             # ← NUEVO
     linkedin_url: str = ""           # ← NUEVO
-    def __hash__(self):
-        return hash((self.name, self.website, self.domain, self.phone_number))
 
 
-@dataclass
+_FIELDS = tuple(f.name for f in fields(Business))
+_field_values = attrgetter(*_FIELDS)  # Business → tupla con todas las columnas
+
+
+@dataclass(slots=True)
 class BusinessList:
     businesses: list = field(default_factory=list)
     seen: set = field(default_factory=set)
@@ -273,95 +450,188 @@ class BusinessList:
         return out
 
     def add(self, b: Business):
-        key = hash(b)
+        # la tupla entra tal cual en el set: sin colisiones de hash() entre negocios distintos
+        key = (b.name, b.website, b.domain, b.phone_number)
         if key not in self.seen:
             self.seen.add(key)
             self.businesses.append(b)
 
     def df(self) -> pd.DataFrame:
-        return pd.json_normalize((asdict(x) for x in self.businesses))
+        return pd.DataFrame.from_records([_field_values(b) for b in self.businesses], columns=_FIELDS)
 
 
 # =========================================================
-# PLAYWRIGHT SAFE HELPERS
+# SELECTORES Y JS DE GOOGLE MAPS
 # =========================================================
 
-def safe_text(page, selector: str) -> str:
-    """
-    Playwright-safe text getter that doesn't raise strict mode errors.
-    """
-    try:
-        loc = page.locator(selector)
-        if loc.count():
-            return loc.nth(0).inner_text().strip()
-    except Exception:
-        pass
-    return ""
+# Selectores de Google Maps, definidos una sola vez
+PLACE_LINK_SELECTOR = 'a[href*="maps/place"]'
+NAME_SELECTOR = 'h1'
+PANE_TITLE_SELECTOR = 'h1.DUwDvf'
+CONSENT_OR_SEARCH_SELECTOR = 'form[action*="consent.google"], iframe[src*="consent.google.com"], #searchboxinput'
+ADDRESS_SELECTOR = 'button[data-item-id="address"] div[class*="fontBody"]'
+WEBSITE_SELECTOR = 'a[data-item-id="authority"] div[class*="fontBody"]'
+PHONE_SELECTOR = 'button[data-item-id^="phone"] div[class*="fontBody"]'
+
+REVIEWS_COUNT_REGEX = re.compile(r"(\d[\d,]*)")
+STARS_REGEX = re.compile(r"(\d+(?:[.,]\d+)?)")
+
+DETAIL_SELECTORS = {
+    "name": NAME_SELECTOR,
+    "address": ADDRESS_SELECTOR,
+    "website": WEBSITE_SELECTOR,
+    "phone": PHONE_SELECTOR,
+}
+
+# Lee todos los campos del panel en un solo viaje al navegador
+DETAILS_JS = """(selectors) => {
+    const data = {};
+    for (const [key, sel] of Object.entries(selectors)) {
+        data[key] = document.querySelector(sel)?.innerText.trim() ?? "";
+    }
+    return data;
+}"""
 
+# Datos visibles en la tarjeta del listado, sin abrir el panel de cada negocio
+CARDS_JS = """(links) => links.map((a) => {
+    const card = a.parentElement;
+    return {
+        href: a.href,
+        name: a.getAttribute('aria-label') ?? "",
+        rating: card.querySelector('span[role="img"]')?.getAttribute('aria-label') ?? "",
+        reviews: card.querySelector('.UY7F9')?.innerText ?? "",
+    };
+})"""
 
-def safe_attr(page, selector: str, attr: str) -> Optional[str]:
-    try:
-        loc = page.locator(selector)
-        if loc.count():
-            return loc.nth(0).get_attribute(attr)
-    except Exception:
-        pass
-    return None
+# La lista de resultados es un div con scroll propio, no la página
+SCROLL_RESULTS_JS = """() => {
+    const feed = document.querySelector('div[role="feed"]') ?? document.scrollingElement;
+    feed.scrollTo(0, feed.scrollHeight);
+}"""
+MORE_RESULTS_JS = "([selector, count]) => document.querySelectorAll(selector).length > count"
+SCROLL_TIMEOUT = 5000  # ms sin tarjetas nuevas = fin de la lista
+
+
+COORDINATES_REGEX = re.compile(r"/@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)")
 
 
 def extract_coordinates(url: str):
-    if "/@" not in url:
-        return None, None
-    try:
-        coords = url.split("/@")[1].split("/")[0].split(",")
-        return float(coords[0]), float(coords[1])
-    except:
-        return None, None
+    m = COORDINATES_REGEX.search(url)
+    return (float(m.group(1)), float(m.group(2))) if m else (None, None)
 
 
 # =========================================================
 # GOOGLE MAPS SCRAPER (STABLE 2025)
 # =========================================================
 
-def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
-    log.info(f"Iniciando MapScrap ULTRA 2025 → {search}")
-    bl = BusinessList()
+# Máximo de pestañas abriendo fichas a la vez (Google limita si son más)
+MAX_DETAIL_TABS = 4
 
-    with sync_playwright() as p:
-        # Lanzar con argumentos anti-detección
-        browser = p.chromium.launch(
-            headless=headless,
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-blink-features=AutomationControlled",
-                "--disable-infobars",
-                "--window-position=0,0",
-                "--ignore-certificate-errors",
-                "--ignore-certificate-errors-spki-list",
-                "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-            ]
-        )
+# Los estilos NO se bloquean: sin CSS el div[role="feed"] no tiene scroll
+# propio y la lista de resultados deja de cargar más tarjetas
+BLOCKED_RESOURCES = {"image", "media", "font"}
 
-        context = browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            locale="en-US",
-            timezone_id="America/New_York"
-        )
-        context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => false})")
 
-        page = context.new_page()
+async def open_browser(p, headless: bool):
+    # Lanzar con argumentos anti-detección
+    browser = await p.chromium.launch(
+        headless=headless,
+        args=[
+            "--no-sandbox",
+            "--disable-setuid-sandbox",
+            "--disable-blink-features=AutomationControlled",
+            "--disable-infobars",
+            "--window-position=0,0",
+            "--ignore-certificate-errors",
+            "--ignore-certificate-errors-spki-list",
+            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+        ]
+    )
+
+    context = await browser.new_context(
+        viewport={"width": 1920, "height": 1080},
+        locale="en-US",
+        timezone_id="America/New_York"
+    )
+    await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => false})")
+    await context.route("**/*", block_assets)
+    return browser, context
+
+
+async def block_assets(route):
+    # Teselas, fotos, vídeos y fuentes no aportan ningún dato
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def apply_details(b: Business, data: dict, url: str):
+    # NOMBRE
+    b.name = b.name or data["name"] or "Nombre no encontrado"
+
+    # DIRECCIÓN
+    b.address = data["address"]
+
+    # WEB
+    if web_text := data["website"]:
+        b.website = web_text if web_text.startswith("http") else "https://" + web_text
+        b.domain = b.website.split("/")[2].replace("www.", "")
+
+    # TELÉFONO
+    b.phone_number = data["phone"]
+
+    # COORDENADAS
+    b.latitude, b.longitude = extract_coordinates(url)
+
+
+async def fetch_details(context, sem: asyncio.Semaphore, bl: BusinessList, i: int, b: Business, href: str, n: int):
+    """
+    Abre la ficha en una pestaña nueva del mismo contexto (cookies ya
+    rechazadas) y la cierra al terminar; `sem` limita las pestañas abiertas.
+    """
+    async with sem:
+        page = await context.new_page()
+        try:
+            await page.goto(href, wait_until="domcontentloaded", timeout=15000)
+            await page.wait_for_selector(PANE_TITLE_SELECTOR, state="visible", timeout=8000)
+            apply_details(b, await page.evaluate(DETAILS_JS, DETAIL_SELECTORS), page.url)
+        except Exception as e:
+            log.warning(f"Sin detalles para negocio {i}: {e}")
+        finally:
+            await page.close()
+
+    bl.add(b)
+    log.debug(f"  {i}/{n} → {b.name} | {b.website or 'sin web'} | {b.phone_number or 'sin tel'}")
+
+
+async def scrape_gmaps(search: str, total: int, headless: bool, details: bool = True, workers: int = 1) -> BusinessList:
+    """
+    Nombre y reseñas salen de las tarjetas del listado; solo si details=True
+    se abre cada negocio (en hasta `workers` pestañas a la vez) para leer
+    dirección, web y teléfono.
+    """
+    log.info(f"Iniciando MapScrap ULTRA 2025 → {search}")
+    bl = BusinessList()
+    jobs = []
+
+    async with async_playwright() as p:
+        browser, context = await open_browser(p, headless)
+        page = await context.new_page()
 
         try:
-            page.goto("https://www.google.com/maps", timeout=90000)
-            page.wait_for_load_state("domcontentloaded")
+            await page.goto("https://www.google.com/maps", timeout=90000)
+            await page.wait_for_load_state("domcontentloaded")
             log.info("Google Maps cargado")
 
    # RECHAZAR COOKIES 2025 — FUNCIONA EN TODA ESPAÑA
             log.info("Intentando rechazar cookies...")
 
-            # 1. Esperar a que aparezca el banner (puede tardar)
-            page.wait_for_timeout(8000)
+            # 1. Esperar al banner o, si no sale, directamente al buscador
+            try:
+                await page.wait_for_selector(CONSENT_OR_SEARCH_SELECTOR, timeout=8000)
+            except PlaywrightTimeoutError:
+                pass
 
             # 2. Lista de selectores que funcionan en español 2025
             reject_selectors = [
@@ -381,12 +651,11 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
             for sel in reject_selectors:
                 try:
                     if sel.startswith("//"):
-                        page.click(sel, timeout=6000)
+                        await page.click(sel, timeout=6000)
                     else:
-                        page.click(sel, timeout=6000)
+                        await page.click(sel, timeout=6000)
                     log.info(f"Cookies rechazadas con selector: {sel}")
                     rejected = True
-                    page.wait_for_timeout(3000)
                     break
                 except Exception as e:
                     continue
@@ -394,9 +663,9 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
             # 3. SI NO FUNCIONA NINGUNO → FORZAR EN EL IFRAME (el truco definitivo)
             if not rejected:
                 try:
-                    page.wait_for_selector('iframe[src*="consent.google.com"]', timeout=10000)
+                    await page.wait_for_selector('iframe[src*="consent.google.com"]', timeout=10000)
                     iframe = page.frames[-1]  # el último iframe suele ser el de consentimiento
-                    iframe.click('button:has-text("Rechazar todo")', timeout=8000)
+                    await iframe.click('button:has-text("Rechazar todo")', timeout=8000)
                     log.info("Cookies rechazadas DENTRO DEL IFRAME (truco español 2025)")
                     rejected = True
                 except:
@@ -421,10 +690,10 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
             for selector in selectors_to_try:
                 try:
                     if selector.startswith("//"):
-                        search_box = page.wait_for_selector(selector, timeout=8000)
+                        search_box = await page.wait_for_selector(selector, timeout=8000)
                     else:
-                        search_box = page.wait_for_selector(selector, timeout=8000)
-                    if search_box and search_box.is_visible():
+                        search_box = await page.wait_for_selector(selector, timeout=8000)
+                    if search_box and await search_box.is_visible():
                         log.info(f"Campo de búsqueda encontrado con: {selector}")
                         break
                 except:
@@ -432,86 +701,48 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
 
             if not search_box:
                 log.error("No se encontró el campo de búsqueda. Posible bloqueo.")
-                browser.close()
+                await browser.close()
                 return bl
 
             # ESCRIBIR Y BUSCAR
-            search_box.click()
-            page.wait_for_timeout(1000)
-            search_box.fill("")
-            page.wait_for_timeout(500)
-            search_box.fill(search)
-            page.wait_for_timeout(1000)
-            page.keyboard.press("Enter")
+            await search_box.click()
+            await search_box.fill(search)
+            await page.keyboard.press("Enter")
             log.info(f"Búsqueda realizada: {search}")
 
             # ESPERAR RESULTADOS
-            page.wait_for_timeout(8000)
             try:
-                page.wait_for_selector('a[href*="maps/place"]', timeout=20000)
+                await page.wait_for_selector(PLACE_LINK_SELECTOR, timeout=20000)
             except:
                 log.error("No hay resultados o Google bloqueó")
-                browser.close()
+                await browser.close()
                 return bl
 
             # SCROLL AUTOMÁTICO HASTA TENER SUFICIENTES
-            scroll_pause = 2500
-            last_height = page.evaluate("document.body.scrollHeight")
-
-            while len(bl.businesses) < total:
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                page.wait_for_timeout(scroll_pause)
-                
-                links = page.locator('a[href*="maps/place"]').all()
-                if len(links) >= total:
-                    links = links[:total]
-                    break
+            place_links = page.locator(PLACE_LINK_SELECTOR)
 
-                new_height = page.evaluate("document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            while (count := await place_links.count()) < total:
+                await page.evaluate(SCROLL_RESULTS_JS)
+                try:
+                    # sigue en cuanto cargan tarjetas nuevas, sin pausa fija
+                    await page.wait_for_function(MORE_RESULTS_JS, arg=[PLACE_LINK_SELECTOR, count], timeout=SCROLL_TIMEOUT)
+                except PlaywrightTimeoutError:
+                    break  # no llegan más: fin de la lista
 
-            # EXTRAER CADA NEGOCIO
-            links = page.locator('a[href*="maps/place"]').all()[:total]
-            log.info(f"Encontrados {len(links)} enlaces. Extrayendo datos...")
+            # EXTRAER CADA NEGOCIO (tarjetas en una sola llamada)
+            cards = (await place_links.evaluate_all(CARDS_JS))[:total]
+            log.info(f"Encontrados {len(cards)} enlaces. Extrayendo datos...")
 
-            for i, link in enumerate(links, 1):
+            for i, card in enumerate(cards, 1):
                 try:
-                    link.click(force=True)
-                    page.wait_for_timeout(4000)
-
                     b = Business()
 
-                    # NOMBRE
-                    try:
-                        b.name = page.locator('h1').first.inner_text(timeout=7000).strip()
-                    except:
-                        b.name = "Nombre no encontrado"
-
-                    # DIRECCIÓN
-                    try:
-                        b.address = page.locator('//button[@data-item-id="address"]//div[contains(@class,"fontBody")]').first.inner_text(timeout=4000).strip()
-                    except:
-                        b.address = ""
-
-                    # WEB
-                    try:
-                        web_text = page.locator('//a[@data-item-id="authority"]//div[contains(@class,"fontBody")]').first.inner_text(timeout=3000).strip()
-                        b.website = web_text if web_text.startswith("http") else "https://" + web_text
-                        b.domain = b.website.split("/")[2].replace("www.", "") if "http" in b.website else web_text
-                    except:
-                        b.website = ""
-                        b.domain = ""
-
-                    # TELÉFONO
-                    try:
-                        b.phone_number = page.locator('//button[contains(@data-item-id,"phone")]//div[contains(@class,"fontBody")]').first.inner_text(timeout=3000).strip()
-                    except:
-                        b.phone_number = ""
-
-                    # COORDENADAS
-                    b.latitude, b.longitude = extract_coordinates(page.url)
+                    # NOMBRE y RESEÑAS desde la tarjeta
+                    b.name = card["name"]
+                    m = REVIEWS_COUNT_REGEX.search(card["reviews"])
+                    b.reviews_count = int(m.group(1).replace(",", "")) if m else None
+                    m = STARS_REGEX.search(card["rating"])
+                    b.reviews_average = float(m.group(1).replace(",", ".")) if m else None
 
                     # CATEGORÍA
                     if " in " in search.lower():
@@ -519,8 +750,12 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
                     else:
                         b.category = search.title()
 
+                    if details:
+                        jobs.append((i, b, card["href"]))
+                        continue
+
                     bl.add(b)
-                    log.info(f"  {i}/{len(links)} → {b.name} | {b.website or 'sin web'} | {b.phone_number or 'sin tel'}")
+                    log.debug(f"  {i}/{len(cards)} → {b.name} | {b.website or 'sin web'} | {b.phone_number or 'sin tel'}")
 
                 except Exception as e:
                     log.error(f"Error en negocio {i}: {e}")
@@ -529,8 +764,17 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
         except Exception as e:
             log.error(f"Error crítico: {e}")
 
+        # ABRIR FICHAS EN PARALELO (pestañas del mismo contexto)
+        try:
+            if jobs:
+                n = len(jobs)
+                tabs = max(1, min(workers, MAX_DETAIL_TABS, n))
+                log.info(f"Abriendo {n} fichas con {tabs} pestañas...")
+                await page.close()
+                sem = asyncio.Semaphore(tabs)
+                await asyncio.gather(*(fetch_details(context, sem, bl, i, b, href, n) for i, b, href in jobs))
         finally:
-            browser.close()
+            await browser.close()
 
     log.info(f"EXTRACCIÓN COMPLETA: {len(bl.businesses)} negocios")
     return bl
@@ -540,49 +784,90 @@ def scrape_gmaps(search: str, total: int, headless: bool) -> BusinessList:
 # PIPELINE
 # =========================================================
 
-def run_pipeline(search: str, total: int, headless: bool, workers: int):
-    bl = scrape_gmaps(search, total, headless)
+UNSAFE_FILENAME_REGEX = re.compile(r"[^A-Za-z0-9_-]")
+
+def site_key(website: Optional[str]) -> str:
+    """
+    Misma web aunque cambie el esquema, las www, mayúsculas del host o la
+    barra final. La ruta cuenta: dos páginas de Facebook no son el mismo sitio.
+    """
+    if not website:
+        return ""
+    parts = urlsplit(website.strip() if "//" in website else "//" + website.strip())
+    return parts.netloc.lower().removeprefix("www.") + parts.path.rstrip("/")
 
-    df = bl.df()
-    log.info(f"📊 GMaps scraped: {len(df)} businesses")
 
-    if len(df) == 0:
+async def scrape_contacts(businesses: list, limit: int, on_result) -> None:
+    """
+    Scrapea todas las webs en un único event loop, con `limit` peticiones en
+    vuelo, y llama a on_result(business, data) según va terminando cada una.
+    """
+    sem = asyncio.Semaphore(limit)
+    # AsyncResolver (aiodns): el DNS no bloquea el event loop como getaddrinfo
+    connector = aiohttp.TCPConnector(
+        resolver=aiohttp.AsyncResolver(),
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        limit=CONNECTOR_LIMIT,
+        limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=False
+    )
+    # Negocios de una misma cadena comparten web: se scrapea una vez por sitio
+    sites = {}
+    for b in businesses:
+        sites.setdefault(site_key(b.website), []).append(b)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=FETCH_TIMEOUT, headers=HEADERS) as session:
+
+        async def scrape(group: list):
+            try:
+                return group, await smart_email_scrape(session, sem, group[0].website or "")
+            except Exception as e:
+                log.warning(f"Sin contactos para {group[0].website}: {e}")
+                return group, {}
+
+        for next_done in asyncio.as_completed([scrape(group) for group in sites.values()]):
+            group, data = await next_done
+            for b in group:
+                on_result(b, data)
+
+
+def run_pipeline(search: str, total: int, headless: bool, workers: int, details: bool = True):
+    bl = asyncio.run(scrape_gmaps(search, total, headless, details, workers))
+
+    log.info(f"📊 GMaps scraped: {len(bl.businesses)} businesses")
+
+    if not bl.businesses:
         out = os.path.join(bl.folder, f"{search.replace(' ', '_')}_FINAL.csv")
-        df.to_csv(out, index=False)
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(_FIELDS)
         log.warning(f"No results. Saved empty CSV: {out}")
         return
 
     # parallel email scraping → AHORA ES CONTACT SCRAPING
-    websites = df["website"].fillna("").tolist()
-    contact_results = [{} for _ in websites]
-
-    log.info(f"Extracting Instagram, WhatsApp, emails... ({workers} workers)")
-
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        future_to_idx = {
-            ex.submit(smart_email_scrape, w): i
-            for i, w in enumerate(websites) if w
-        }
+    limit = max(1, workers) * 10  # con 0 workers el semáforo no dejaría pasar nada
+    out = f"{UNSAFE_FILENAME_REGEX.sub('_', search)}_FINAL.csv"
 
-        for future in as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            try:
-                data = future.result()
-                contact_results[idx] = data
-            except:
-                contact_results[idx] = {}
+    log.info(f"Extracting Instagram, WhatsApp, emails... ({limit} requests at a time)")
 
-    # Aplicar todos los datos al DataFrame
-    for key in ["email", "email_source", "instagram_username", "instagram_url",
-                "whatsapp_number", "facebook_url"]:
-        df[key] = [contact_results[i].get(key, "") for i in range(len(df))]
+    # Cada negocio se escribe en cuanto terminan sus contactos: el CSV nunca
+    # se monta entero en memoria y un corte deja guardado lo ya hecho
+    with open(out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(_FIELDS)
 
-    out = f"{re.sub(r'[^A-Za-z0-9_-]', '_', search)}_FINAL.csv"
+        def save(b: Business, data: dict):
+            for key, value in data.items():
+                setattr(b, key, value)
+            writer.writerow(_field_values(b))
+            f.flush()
 
+        asyncio.run(scrape_contacts(bl.businesses, limit, save))
 
-    df.to_csv(out, index=False)
-    #log the data collected in table
-    log.info(df)
+    #log the data collected in table (solo en DEBUG: montar el DataFrame cuesta)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(bl.df())
     log.info(f"💾 Saved {out}")
 
 
@@ -603,7 +888,8 @@ if __name__ == "__main__":
             search=args["search"],
             total=args["total"],
             headless=args["headless"],
-            workers=args["workers"]
+            workers=args["workers"],
+            details=args["details"]
         )
 
         rprint("\n[bold green]🎉 All done! Check your output folder.[/bold green]")